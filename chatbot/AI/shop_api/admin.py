@@ -6,7 +6,7 @@ from .models import ConversationHistory, SessionMetadata, UserFeedback
 class ConversationHistoryAdmin(admin.ModelAdmin):
     list_display = ['session_id', 'shop_id', 'timestamp']
     list_filter = ['shop_id', 'message_type']
-    search_fields = ['session_id', 'user_message', 'shop_id']
+    search_fields = ['session__session_id', 'user_message', 'shop_id']
     readonly_fields = ['timestamp']
 
 @admin.register(SessionMetadata)
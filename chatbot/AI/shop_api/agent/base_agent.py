@@ -11,6 +11,10 @@ from .utils import clean_ai_response
 
 logger = logging.getLogger(__name__)
 
+# Requests for the same session are serialized through one of a fixed set of
+# striped locks, so unrelated sessions can wait on the LLM concurrently.
+_SESSION_LOCK_STRIPES = 64
+
 
 class UniversalShopAgent:
     """Main agent class coordinating all components."""
@@ -19,7 +23,7 @@ class UniversalShopAgent:
         self.data_manager = data_manager
         self.session_manager = session_manager
         self.validation_system = None  # Will be imported lazily
-        self._session_lock = threading.RLock()
+        self._session_locks = tuple(threading.RLock() for _ in range(_SESSION_LOCK_STRIPES))
         
         # Initialize components
         self.conversation_manager = ConversationManager()
@@ -59,7 +63,7 @@ class UniversalShopAgent:
         """Main entry point for handling shop requests."""
         logger.info(f"New request: {user_message}")
         
-        with self._session_lock:
+        with self._session_lock(session_id):
             try:
                 # Get or create session
                 session = self.session_manager.get_session(
@@ -189,6 +193,10 @@ class UniversalShopAgent:
                 self.conversation_manager.add_to_conversation_cache(session_id, 'assistant', emergency_response['response'])
                 return emergency_response
     
+    def _session_lock(self, session_id: str) -> threading.RLock:
+        """Return the lock guarding a session's reservation state."""
+        return self._session_locks[hash(session_id) % _SESSION_LOCK_STRIPES]
+    
     def _is_cancellation_request(self, user_message: str) -> bool:
         """Check if the message is a cancellation request."""
         cancellation_words = ['cancel', 'stop', 'nevermind', 'never mind', 'leave it', 
@@ -26,22 +26,25 @@ class ConversationManager:
                 if not context_messages:
                     try:
                         from ..models import ConversationHistory
+                        # Only the three columns used, as tuples
                         history = ConversationHistory.objects.filter(
                             session_id=session_id
-                        ).order_by('timestamp')[:10]
+                        ).order_by('timestamp').values_list(
+                            'user_message', 'assistant_response', 'timestamp'
+                        )[:10]
                         
                         if history:
                             self.conversation_cache[session_id] = []
-                            for turn in history:
+                            for user_message, assistant_response, timestamp in history:
                                 self.conversation_cache[session_id].append({
                                     'role': 'user', 
-                                    'content': turn.user_message,
-                                    'timestamp': turn.timestamp
+                                    'content': user_message,
+                                    'timestamp': timestamp
                                 })
                                 self.conversation_cache[session_id].append({
                                     'role': 'assistant', 
-                                    'content': turn.assistant_response,
-                                    'timestamp': turn.timestamp
+                                    'content': assistant_response,
+                                    'timestamp': timestamp
                                 })
                             context_messages = self.conversation_cache[session_id][-10:]
                     except Exception as e:
@@ -83,18 +83,9 @@ class ReservationHandler:
                 
                 # Check availability
                 if not self.data_manager.check_availability(shop_id, pending_reservation.get('date'), pending_reservation.get('time')):
-                    response = "That time slot is no longer available. Would you like to try a different time?"
-                    self.session_manager.clear_reservation_state(session_id)
-                    conversation_manager.clear_conversation_cache(session_id)
-                    conversation_manager.add_to_conversation_cache(session_id, 'assistant', response)
-                    self.session_manager.update_conversation(session_id, user_message, response, "reservation_error")
-                    return {
-                        "response": response,
-                        "shop_id": shop_id,
-                        "shop_name": shop_details.get('shop_name', 'Our Shop'),
-                        "success": False,
-                        "session_id": session_id
-                    }
+                    return self._slot_unavailable_response(
+                        user_message, shop_id, session_id, shop_details, conversation_manager
+                    )
                 
                 # Ensure we have user info
                 if not pending_reservation.get('phone_number') and session_data.get('user_phone'):
@@ -104,10 +95,16 @@ class ReservationHandler:
                 if not pending_reservation.get('email') and session_data.get('user_email'):
                     pending_reservation['email'] = session_data.get('user_email', '')
                 
-                # Save reservation
-                save_result = self.data_manager.save_reservation(shop_id, pending_reservation)
+                # Save reservation; the capacity check is repeated atomically with
+                # the insert, since other sessions may have booked the slot since
+                save_result = self.data_manager.save_reservation(shop_id, pending_reservation, enforce_capacity=True)
                 logger.info(f"Database save result: {save_result}")
                 
+                if save_result.get('slot_unavailable'):
+                    return self._slot_unavailable_response(
+                        user_message, shop_id, session_id, shop_details, conversation_manager
+                    )
+                
                 if save_result['success']:
                     response = f"""RESERVATION CONFIRMED
 
@@ -175,7 +172,29 @@ We look forward to seeing you."""
             self.session_manager.clear_reservation_state(session_id)
             conversation_manager.clear_conversation_cache(session_id)
             raise
-    
+
+    def _slot_unavailable_response(
+        self,
+        user_message: str,
+        shop_id: str,
+        session_id: str,
+        shop_details: Dict[str, Any],
+        conversation_manager
+    ) -> Dict[str, Any]:
+        """Reset the reservation flow after the requested slot filled up."""
+        response = "That time slot is no longer available. Would you like to try a different time?"
+        self.session_manager.clear_reservation_state(session_id)
+        conversation_manager.clear_conversation_cache(session_id)
+        conversation_manager.add_to_conversation_cache(session_id, 'assistant', response)
+        self.session_manager.update_conversation(session_id, user_message, response, "reservation_error")
+        return {
+            "response": response,
+            "shop_id": shop_id,
+            "shop_name": shop_details.get('shop_name', 'Our Shop'),
+            "success": False,
+            "session_id": session_id
+        }
+
     def generate_reservation_summary(
         self,
         reservation_data: Dict[str, Any],
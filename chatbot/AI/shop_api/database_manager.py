@@ -193,22 +193,10 @@ class DatabaseManager:
                 cursor = conn.cursor()
                 
                 # Get shop policy
-                shop_context = self.load_shop_context(shop_id)
-                max_reservations = shop_context['shop_details'].get(
-                    'reservation_policy', {}
-                ).get('max_reservations_per_hour', 4)
+                max_reservations = self._max_reservations_per_hour(shop_id)
                 
                 # Count reservations for the given date and time
-                cursor.execute('''
-                    SELECT COUNT(*) as count 
-                    FROM reservations 
-                    WHERE reservation_date = ? 
-                      AND reservation_time = ? 
-                      AND status = 'confirmed'
-                ''', (date, time))
-                
-                result = cursor.fetchone()
-                count = result['count'] if result else 0
+                count = self._count_confirmed(cursor, date, time)
                 
                 logger.info(f"Availability check for {shop_id}: {count}/{max_reservations} slots booked")
                 return count < max_reservations
@@ -217,15 +205,53 @@ class DatabaseManager:
             logger.error(f"Error checking availability: {e}")
             return False
     
-    def save_reservation(self, shop_id: str, reservation_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Save a reservation to shop's Reservation.db"""
+    def _max_reservations_per_hour(self, shop_id: str) -> int:
+        shop_context = self.load_shop_context(shop_id)
+        return shop_context['shop_details'].get(
+            'reservation_policy', {}
+        ).get('max_reservations_per_hour', 4)
+    
+    def _count_confirmed(self, cursor, date: str, time: str) -> int:
+        cursor.execute('''
+            SELECT COUNT(*) as count 
+            FROM reservations 
+            WHERE reservation_date = ? 
+              AND reservation_time = ? 
+              AND status = 'confirmed'
+        ''', (date, time))
+        
+        result = cursor.fetchone()
+        return result['count'] if result else 0
+    
+    def save_reservation(self, shop_id: str, reservation_data: Dict[str, Any],
+                         enforce_capacity: bool = False) -> Dict[str, Any]:
+        """Save a reservation to shop's Reservation.db
+        
+        With enforce_capacity the slot count and the INSERT run in one write
+        transaction, so concurrent bookings (from any thread or process)
+        cannot push a slot past max_reservations_per_hour. A full slot
+        returns {'success': False, 'slot_unavailable': True, ...}.
+        """
         try:
             # Generate unique reservation ID
             reservation_id = f"RES{int(time.time())}{random.randint(1000, 9999)}"
             
+            if enforce_capacity:
+                max_reservations = self._max_reservations_per_hour(shop_id)
+            
             with self.get_reservation_connection(shop_id) as conn:
                 cursor = conn.cursor()
                 
+                if enforce_capacity:
+                    # Take SQLite's write lock before counting; a second booking
+                    # waits here until this one commits or rolls back
+                    cursor.execute('BEGIN IMMEDIATE')
+                    count = self._count_confirmed(cursor, reservation_data.get('date'), reservation_data.get('time'))
+                    if count >= max_reservations:
+                        conn.rollback()
+                        logger.info(f"Slot full for {shop_id}: {count}/{max_reservations} slots booked")
+                        return {'success': False, 'slot_unavailable': True, 'error': 'Time slot is fully booked'}
+                
                 cursor.execute('''
                     INSERT INTO reservations 
                     (reservation_id, customer_name, phone_number, email, 
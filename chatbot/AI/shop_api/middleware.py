@@ -39,10 +39,8 @@ class RateLimitMiddleware(MiddlewareMixin):
     def get_client_ip(self, request):
         x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
         if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0]
-        else:
-            ip = request.META.get('REMOTE_ADDR')
-        return ip
+            return x_forwarded_for.partition(',')[0].strip()
+        return request.META.get('REMOTE_ADDR')
 
 class SecurityHeadersMiddleware(MiddlewareMixin):
     def process_response(self, request, response):
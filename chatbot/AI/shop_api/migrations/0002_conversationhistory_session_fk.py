@@ -0,0 +1,54 @@
+# Generated by Django 5.2.4 on 2026-10-15 22:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def create_missing_sessions(apps, schema_editor):
+    """Give every history row a SessionMetadata row so the FK can be enforced."""
+    ConversationHistory = apps.get_model('shop_api', 'ConversationHistory')
+    SessionMetadata = apps.get_model('shop_api', 'SessionMetadata')
+    
+    existing = set(SessionMetadata.objects.values_list('session_id', flat=True))
+    missing = {}
+    for session_id, shop_id in ConversationHistory.objects.values_list('session', 'shop_id').order_by('timestamp'):
+        if session_id not in existing:
+            missing.setdefault(session_id, shop_id)
+    
+    SessionMetadata.objects.bulk_create(
+        SessionMetadata(session_id=session_id, shop_id=shop_id, user_preferences={})
+        for session_id, shop_id in missing.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop_api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='conversationhistory',
+            name='shop_api_co_session_ad4a47_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='sessionmetadata',
+            name='shop_api_se_shop_id_375722_idx',
+        ),
+        migrations.RenameField(
+            model_name='conversationhistory',
+            old_name='session_id',
+            new_name='session',
+        ),
+        migrations.RunPython(create_missing_sessions, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='conversationhistory',
+            name='session',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='shop_api.sessionmetadata'),
+        ),
+        migrations.AddIndex(
+            model_name='sessionmetadata',
+            index=models.Index(fields=['shop_id', '-created_at'], name='shop_api_se_shop_id_6c8b1f_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.4 on 2026-10-15 22:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop_api', '0002_conversationhistory_session_fk'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='conversationhistory',
+            index=models.Index(fields=['session', 'shop_id', '-timestamp'], name='conv_lookup_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-15 23:15
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop_api', '0003_conversationhistory_conv_lookup_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='conversationhistory',
+            name='timestamp',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -1,21 +1,23 @@
 # shop_api/models.py
 from django.db import models
+from django.utils import timezone
 import json
 
 class ConversationHistory(models.Model):
-    session_id = models.CharField(max_length=100)
+    session = models.ForeignKey('SessionMetadata', on_delete=models.CASCADE, db_index=True)
     shop_id = models.CharField(max_length=50)  # Changed from ForeignKey to CharField
     user_message = models.TextField()
     assistant_response = models.TextField()
     message_type = models.CharField(max_length=50, default='normal')
     metadata = models.JSONField(default=dict)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    timestamp = models.DateTimeField(default=timezone.now)
 
     class Meta:
         indexes = [
-            models.Index(fields=['session_id']),
             models.Index(fields=['shop_id']),
             models.Index(fields=['timestamp']),
+            # Covers the history lookup: filter on session/shop, ordered by time
+            models.Index(fields=['session', 'shop_id', '-timestamp'], name='conv_lookup_idx'),
         ]
     
     def __str__(self):
@@ -40,7 +42,7 @@ class SessionMetadata(models.Model):
 
     class Meta:
         indexes = [
-            models.Index(fields=['shop_id']),
+            models.Index(fields=['shop_id', '-created_at']),
             models.Index(fields=['created_at']),
             models.Index(fields=['user_email']),
         ]
@@ -0,0 +1,20 @@
+# shop_api/renderers.py
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+_fallback_encoder = JSONEncoder()
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSONRenderer backed by orjson, writing bytes directly.
+
+    Types orjson does not know (Decimal, lazy strings, querysets, ...) go
+    through DRF's own encoder so the output matches JSONRenderer.
+    """
+    options = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return orjson.dumps(data, default=_fallback_encoder.default, option=self.options)
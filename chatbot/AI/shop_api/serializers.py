@@ -18,28 +18,31 @@ class UserFeedbackSerializer(serializers.ModelSerializer):
         model = UserFeedback
         fields = '__all__'
 
+def _is_blank(data):
+    return data is None or (isinstance(data, str) and not data.strip())
+
+# Fields that turn blank (empty or whitespace-only) input into None before
+# any validators run
+class NullableEmailField(serializers.EmailField):
+    def run_validation(self, data=serializers.empty):
+        if _is_blank(data):
+            return None
+        return super().run_validation(data)
+
+class NullableCharField(serializers.CharField):
+    def run_validation(self, data=serializers.empty):
+        if _is_blank(data):
+            return None
+        return super().run_validation(data)
+
 # Chat request serializer
 class ChatRequestSerializer(serializers.Serializer):
+    # CharField trims whitespace and rejects blank input itself
     message = serializers.CharField(max_length=1000, required=True)
     session_id = serializers.CharField(required=False, allow_blank=True, default="")
-    user_email = serializers.EmailField(required=False, allow_blank=True, default="")
+    user_email = NullableEmailField(required=False, allow_null=True, default=None)
     user_name = serializers.CharField(max_length=100, required=False, allow_blank=True, default="")
-    user_phone = serializers.CharField(max_length=20, required=False, allow_blank=True, default="")
-
-    def validate_message(self, value):
-        if not value or not value.strip():
-            raise serializers.ValidationError("Message cannot be empty")
-        return value.strip()
-    
-    def validate_user_email(self, value):
-        if value == "":
-            return None  # Convert empty string to None
-        return value
-    
-    def validate_user_phone(self, value):
-        if value == "":
-            return None  # Convert empty string to None
-        return value
+    user_phone = NullableCharField(max_length=20, required=False, allow_null=True, default=None)
 
 # JSON data serializers (for your JSON files)
 class ShopDetailsSerializer(serializers.Serializer):
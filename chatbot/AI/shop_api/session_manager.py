@@ -1,7 +1,12 @@
 # shop_api/session_manager.py
 import time
+import atexit
 import logging
-from datetime import datetime, timedelta
+from collections import deque
+from itertools import islice
+from django.db import close_old_connections
+from django.db.models import F
+from django.utils import timezone
 from threading import Lock
 import threading
 from .models import SessionMetadata, ConversationHistory
@@ -10,12 +15,30 @@ import uuid
 logger = logging.getLogger(__name__)
 
 class EnhancedSessionManager:
-    def __init__(self, session_timeout_minutes: int = 60):
+    def __init__(self, session_timeout_minutes: int = 60,
+                 history_flush_interval_s: float = 2.0, history_batch_size: int = 500):
         self.sessions = {}
-        self.session_timeout = timedelta(minutes=session_timeout_minutes)
+        self.session_timeout_s = session_timeout_minutes * 60
         self._lock = Lock()
         self._session_locks = {}
         self._cleanup_lock = threading.RLock()
+        
+        # Conversation history is buffered in memory and written in bulk
+        # by a background thread, keeping the INSERT off the chat request path.
+        self._history_buffer = deque()
+        self._history_flush_interval_s = history_flush_interval_s
+        self._history_batch_size = history_batch_size
+        self._history_flush_lock = Lock()
+        self._history_thread_lock = Lock()
+        self._history_flusher = None
+        self._history_wakeup = threading.Event()
+        
+        # Per-message SessionMetadata updates are coalesced per session and
+        # applied by the same flusher thread.
+        self._pending_metadata = {}
+        self._metadata_lock = Lock()
+        atexit.register(self.flush_conversation_history)
+        atexit.register(self.flush_session_metadata)
         logger.info("Enhanced Session Manager Initialized")
     
     def get_session(self, session_id, shop_id, user_agent=None, ip_address=None, 
@@ -32,7 +55,7 @@ class EnhancedSessionManager:
                     'conversation_history': [],
                     'user_preferences': db_session.user_preferences,
                     'created_at': db_session.created_at,
-                    'last_activity': db_session.last_activity,
+                    'last_activity_ts': time.monotonic(),
                     'message_count': db_session.message_count,
                     'reservation_state': db_session.reservation_state,
                     'reservation_data': db_session.reservation_data,
@@ -55,8 +78,8 @@ class EnhancedSessionManager:
                         'shop_id': shop_id,
                         'conversation_history': [],
                         'user_preferences': {},
-                        'created_at': datetime.now(),
-                        'last_activity': datetime.now(),
+                        'created_at': timezone.now(),
+                        'last_activity_ts': time.monotonic(),
                         'message_count': 0,
                         'reservation_state': None,
                         'reservation_data': {},
@@ -72,18 +95,19 @@ class EnhancedSessionManager:
                     'shop_id': shop_id,
                     'conversation_history': [],
                     'user_preferences': {},
-                    'created_at': datetime.now(),
-                    'last_activity': datetime.now(),
+                    'created_at': timezone.now(),
+                    'last_activity_ts': time.monotonic(),
                     'message_count': 0,
                     'reservation_state': None,
                     'reservation_data': {},
                     'pending_reservation': None,
                     'user_email': user_email,
                     'user_name': user_name,
-                    'user_phone': user_phone
+                    'user_phone': user_phone,
+                    'in_memory_only': True
                     }
             else:
-                self.sessions[session_id]['last_activity'] = datetime.now()
+                self.sessions[session_id]['last_activity_ts'] = time.monotonic()
                 self.sessions[session_id]['message_count'] += 1
                 if user_email:
                     self.sessions[session_id]['user_email'] = user_email
@@ -97,33 +121,121 @@ class EnhancedSessionManager:
     def update_conversation(self, session_id, user_message, assistant_response, message_type="normal"):
         if session_id in self.sessions:
             session = self.sessions[session_id]
-            session['last_activity'] = datetime.now()
+            session['last_activity_ts'] = time.monotonic()
+            
+            # History rows reference SessionMetadata, so a session that never
+            # reached the database must be written before its turns are queued
+            if session.get('in_memory_only') and not self._persist_session(session_id, session):
+                return
             
-            # Save to database
+            # Queue history row; the flusher thread writes it with bulk_create
+            self._history_buffer.append(ConversationHistory(
+                session_id=session_id,
+                shop_id=session['shop_id'],  # Use shop_id directly
+                user_message=user_message[:4000],
+                assistant_response=assistant_response[:4000],
+                message_type=message_type,
+                metadata={'agents_used': ['conversation']},
+                timestamp=timezone.now()
+            ))
+            self._ensure_history_flusher()
+            if len(self._history_buffer) >= self._history_batch_size:
+                self._history_wakeup.set()
+            
+            # Queue session metadata update; written by the flusher thread
+            with self._metadata_lock:
+                pending = self._pending_metadata.setdefault(session_id, {'message_count': 0})
+                pending['message_count'] += 1
+                pending['last_activity'] = timezone.now()
+                for field in ('user_email', 'user_name', 'user_phone'):
+                    if field in session:
+                        pending[field] = session[field]
+    
+    def _persist_session(self, session_id, session):
+        try:
+            SessionMetadata.objects.get_or_create(
+                session_id=session_id,
+                defaults={
+                    'shop_id': session['shop_id'],
+                    'user_preferences': session['user_preferences'],
+                    'user_email': session['user_email'],
+                    'user_name': session['user_name'],
+                    'user_phone': session['user_phone'],
+                }
+            )
+        except Exception as e:
+            logger.warning(f"Session {session_id} is still in-memory only, not saving conversation history: {e}")
+            return False
+        session.pop('in_memory_only', None)
+        return True
+    
+    def get_buffered_history(self, session_id, shop_id):
+        """Return history entries for a session that are not yet flushed to the database."""
+        # Written rows stay in the buffer until the flusher pops them; they
+        # already have a pk (bulk_create returns ids on SQLite and PostgreSQL),
+        # so skip them here or the history view would list them twice.
+        return [
+            entry for entry in list(self._history_buffer)
+            if entry.pk is None and entry.session_id == session_id and entry.shop_id == shop_id
+        ]
+    
+    def flush_conversation_history(self):
+        """Write all buffered conversation history rows to the database."""
+        with self._history_flush_lock:
+            while self._history_buffer:
+                # Entries stay visible to get_buffered_history until written;
+                # only this thread pops and appends only happen on the right.
+                batch = list(islice(self._history_buffer, self._history_batch_size))
+                try:
+                    ConversationHistory.objects.bulk_create(batch, batch_size=self._history_batch_size)
+                except Exception as e:
+                    # The batch was rolled back; save row by row so one bad
+                    # entry does not take the rest of the batch with it
+                    logger.warning(f"Bulk save of {len(batch)} conversation entries failed, retrying individually: {e}")
+                    self._save_history_rows(batch)
+                for _ in batch:
+                    self._history_buffer.popleft()
+    
+    def _save_history_rows(self, rows):
+        for entry in rows:
+            entry.pk = None
             try:
-                ConversationHistory.objects.create(
-                    session_id=session_id,
-                    shop_id=session['shop_id'],  # Use shop_id directly
-                    user_message=user_message[:4000],
-                    assistant_response=assistant_response[:4000],
-                    message_type=message_type,
-                    metadata={'agents_used': ['conversation']}
-                )
-                
-                # Update session metadata
-                db_session = SessionMetadata.objects.get(session_id=session_id)
-                db_session.last_activity = datetime.now()
-                db_session.message_count += 1
-                if 'user_email' in session:
-                    db_session.user_email = session['user_email']
-                if 'user_name' in session:
-                    db_session.user_name = session['user_name']
-                if 'user_phone' in session:
-                    db_session.user_phone = session['user_phone']
-                db_session.save()
-                
+                entry.save(force_insert=True)
             except Exception as e:
-                logger.error(f"Error saving conversation to database: {e}")
+                logger.error(f"Error saving conversation entry for session {entry.session_id}: {e}")
+    
+    def flush_session_metadata(self):
+        """Apply queued SessionMetadata updates, one UPDATE per session."""
+        with self._metadata_lock:
+            pending, self._pending_metadata = self._pending_metadata, {}
+        
+        for session_id, updates in pending.items():
+            updates['message_count'] = F('message_count') + updates['message_count']
+            try:
+                SessionMetadata.objects.filter(pk=session_id).update(**updates)
+            except Exception as e:
+                logger.error(f"Error updating session metadata in database: {e}")
+    
+    def _ensure_history_flusher(self):
+        # Started lazily so worker processes create their own thread after fork
+        if self._history_flusher is not None and self._history_flusher.is_alive():
+            return
+        with self._history_thread_lock:
+            if self._history_flusher is None or not self._history_flusher.is_alive():
+                self._history_flusher = threading.Thread(
+                    target=self._history_flush_loop,
+                    name="conversation-history-flusher",
+                    daemon=True
+                )
+                self._history_flusher.start()
+    
+    def _history_flush_loop(self):
+        while True:
+            self._history_wakeup.wait(self._history_flush_interval_s)
+            self._history_wakeup.clear()
+            close_old_connections()
+            self.flush_conversation_history()
+            self.flush_session_metadata()
     
     def set_reservation_state(self, session_id, state, data=None):
         if session_id in self.sessions:
@@ -134,10 +246,10 @@ class EnhancedSessionManager:
             
             # Update database
             try:
-                db_session = SessionMetadata.objects.get(session_id=session_id)
-                db_session.reservation_state = state
-                db_session.reservation_data = self.sessions[session_id]['reservation_data']
-                db_session.save()
+                SessionMetadata.objects.filter(pk=session_id).update(
+                    reservation_state=state,
+                    reservation_data=self.sessions[session_id]['reservation_data']
+                )
             except Exception as e:
                 logger.error(f"Error updating reservation state in database: {e}")
     
@@ -155,11 +267,11 @@ class EnhancedSessionManager:
             
             # Update database
             try:
-                db_session = SessionMetadata.objects.get(session_id=session_id)
-                db_session.reservation_state = None
-                db_session.reservation_data = {}
-                db_session.pending_reservation = None
-                db_session.save()
+                SessionMetadata.objects.filter(pk=session_id).update(
+                    reservation_state=None,
+                    reservation_data={},
+                    pending_reservation=None
+                )
             except Exception as e:
                 logger.error(f"Error clearing reservation state in database: {e}")
     
@@ -169,9 +281,9 @@ class EnhancedSessionManager:
             
             # Update database
             try:
-                db_session = SessionMetadata.objects.get(session_id=session_id)
-                db_session.pending_reservation = reservation_data
-                db_session.save()
+                SessionMetadata.objects.filter(pk=session_id).update(
+                    pending_reservation=reservation_data
+                )
             except Exception as e:
                 logger.error(f"Error setting pending reservation in database: {e}")
     
@@ -181,12 +293,13 @@ class EnhancedSessionManager:
         return None
     
     def _cleanup_expired_sessions(self):
-        current_time = datetime.now()
+        now_ts = time.monotonic()
+        timeout_s = self.session_timeout_s
         expired_sessions = []
         
         with self._lock:
             for session_id, session_data in list(self.sessions.items()):
-                if current_time - session_data['last_activity'] > self.session_timeout:
+                if now_ts - session_data['last_activity_ts'] > timeout_s:
                     expired_sessions.append(session_id)
             
             for session_id in expired_sessions:
@@ -0,0 +1,89 @@
+# shop_api/tasks.py
+import uuid
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+# Results are kept in the Django cache so any worker can answer a status
+# poll, not just the one that ran the task. That needs a cache shared between
+# processes; see tasks_supported.
+TASK_RESULT_TIMEOUT = 600
+TASK_MAX_WORKERS = 8
+# Tasks queued or running in this process before new submissions are refused
+TASK_MAX_QUEUED = 64
+
+# Threads are only spawned on the first submit, so each forked worker
+# process starts its own.
+_executor = ThreadPoolExecutor(max_workers=TASK_MAX_WORKERS, thread_name_prefix="shop-api-task")
+_queued = 0
+_queued_lock = threading.Lock()
+
+
+def _task_key(scope: str, task_id: str) -> str:
+    return f"shop:task:{scope}:{task_id}"
+
+
+def tasks_supported() -> bool:
+    """Whether the default cache can carry task state between worker processes.
+    
+    LocMemCache is private to each process and DummyCache stores nothing, so
+    with either a status poll reaching another worker would report an
+    unknown task.
+    """
+    return not isinstance(caches['default'], (LocMemCache, DummyCache))
+
+
+def submit_task(scope: str, func, *args, **kwargs):
+    """Run func(*args, **kwargs) in the background and return a task id for get_task.
+    
+    Returns None without queueing anything once TASK_MAX_QUEUED tasks are
+    already queued or running.
+    """
+    global _queued
+    with _queued_lock:
+        if _queued >= TASK_MAX_QUEUED:
+            return None
+        _queued += 1
+    
+    task_id = uuid.uuid4().hex
+    try:
+        cache.set(_task_key(scope, task_id), {"status": "pending"}, TASK_RESULT_TIMEOUT)
+        _executor.submit(_run_task, scope, task_id, func, args, kwargs)
+    except Exception:
+        _task_done()
+        raise
+    return task_id
+
+
+def get_task(scope: str, task_id: str):
+    """Return {'status': 'pending'|'completed'|'failed', ...} or None if unknown/expired."""
+    return cache.get(_task_key(scope, task_id))
+
+
+def _task_done():
+    global _queued
+    with _queued_lock:
+        _queued -= 1
+
+
+def _run_task(scope, task_id, func, args, kwargs):
+    try:
+        # The pending entry may have aged while the task waited for a worker
+        cache.set(_task_key(scope, task_id), {"status": "pending"}, TASK_RESULT_TIMEOUT)
+        close_old_connections()
+        try:
+            state = {"status": "completed", "result": func(*args, **kwargs)}
+        except Exception as e:
+            logger.error(f"Background task {task_id} failed: {e}", exc_info=True)
+            state = {"status": "failed"}
+        finally:
+            close_old_connections()
+        cache.set(_task_key(scope, task_id), state, TASK_RESULT_TIMEOUT)
+    finally:
+        _task_done()
@@ -0,0 +1,37 @@
+import os
+import sys
+import subprocess
+import textwrap
+from django.test import SimpleTestCase
+from . import views
+
+# Managers are per-process singletons, so only a fresh interpreter exercises
+# the first-use path. The manager classes are patched out to keep it offline.
+WARM_MANAGERS_SCRIPT = textwrap.dedent(f"""
+    import importlib
+    import django
+    from unittest import mock
+    django.setup()
+    views = importlib.import_module({views.__name__!r})
+    with mock.patch.object(views, 'DatabaseManager'), \\
+         mock.patch.object(views, 'SecurityValidationSystem'), \\
+         mock.patch.object(views, 'EnhancedSessionManager'), \\
+         mock.patch.object(views, 'UniversalShopAgent'):
+        views.warm_managers()
+    print(sorted(views._managers))
+""")
+
+
+class WarmManagersTests(SimpleTestCase):
+    def test_warm_managers_completes_in_fresh_process(self):
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        try:
+            result = subprocess.run(
+                [sys.executable, '-c', WARM_MANAGERS_SCRIPT],
+                capture_output=True, text=True, timeout=30, env=env
+            )
+        except subprocess.TimeoutExpired:
+            self.fail("warm_managers() did not return; manager creation deadlocked")
+        
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn("'universal_agent'", result.stdout)
@@ -4,6 +4,9 @@ from . import views
 urlpatterns = [
     path('api/v1/health/', views.HealthCheckView.as_view(), name='health_check'),
     path('api/v1/<str:shop_id>/message/', views.ShopMessageView.as_view(), name='shop_message'),
+    path('api/v1/<str:shop_id>/message/async/', views.ShopMessageTaskView.as_view(), name='shop_message_async'),
+    path('api/v1/<str:shop_id>/messages/<str:task_id>/', 
+         views.ShopMessageTaskStatusView.as_view(), name='shop_message_status'),
     path('api/v1/<str:shop_id>/services/', views.ShopServicesView.as_view(), name='shop_services'),
     path('api/v1/<str:shop_id>/info/', views.ShopInfoView.as_view(), name='shop_info'),
     path('api/v1/shops/', views.AllShopsView.as_view(), name='all_shops'),
@@ -7,6 +7,83 @@ from django.conf import settings
 
 logger = logging.getLogger(__name__)
 
+_DIGITS = frozenset('0123456789')
+
+_PARTY_CONTEXT_WORDS = ('people|persons|guests|person|adults|kids|'
+                        'children|group|party|size|for|of|with')
+_NUMBER_RE = re.compile(r'\b\d+\b')
+# "<number> people" -- matched right after the number
+_PARTY_CONTEXT_AFTER_RE = re.compile(rf'\s+(?:{_PARTY_CONTEXT_WORDS})\b')
+# "party of <number>" -- searched in a short window ending at the number
+_PARTY_CONTEXT_BEFORE_RE = re.compile(rf'\b(?:{_PARTY_CONTEXT_WORDS})\s+$')
+_PARTY_CONTEXT_WINDOW = 32
+
+# Checked in order; the first service whose keywords appear anywhere wins
+_SERVICE_PATTERNS = tuple((re.compile(keyword), service) for keyword, service in (
+    ('haircut|hair cut', 'Haircut'),
+    ('beard|trim|shape', 'Beard Trim & Shape'),
+    ('shave', 'Traditional Shave'),
+    ('color|coloring', 'Hair Coloring'),
+    ('treatment|keratin', 'Keratin Treatment'),
+    ('classic', 'Classic Haircut'),
+    ('massage', 'Massage'),
+    ('dinner|dining', 'Dinner Reservation'),
+    ('brunch', 'Weekend Brunch'),
+    ('private|room', 'Private Dining Room'),
+    ('appointment|booking|reservation', 'General Service'),
+))
+# Screens out messages that mention no service at all in a single scan
+_ANY_SERVICE_RE = re.compile('|'.join(pattern.pattern for pattern, _ in _SERVICE_PATTERNS))
+
+# Any one of these means a party of 1 (or 2 for the group indicators)
+_STRICT_SOLO_RE = re.compile('|'.join((
+    r'\balone\b',
+    r'\bsolo\b',
+    r'\bjust me\b',
+    r'\bonly me\b',
+    r'\bmyself\b',
+    r'\bfor me\b(?!\s+and)',
+    r'\bjust for me\b',
+    r'\bsingle\b',
+    r'\bone person\b',
+    r'\bone\b(?!\s+more|\s+other|\s+extra)',
+    r'\bby myself\b',
+    r'\bon my own\b',
+)))
+_GROUP_INDICATOR_RE = re.compile('|'.join((
+    r'\bboth\b',
+    r'\btogether\b',
+    r'\bwe are\b',
+    r'\bwe\'\sre\b',
+    r'\bus\b',
+    r'\ball of us\b',
+    r'\beveryone\b',
+)))
+
+_RELATIONSHIP_INDICATORS = tuple((relationship, base_size, re.compile(rf'\b{relationship}\b')) for relationship, base_size in {
+    'brother': 2, 'sister': 2, 'friend': 2, 'friends': 2,
+    'partner': 2, 'wife': 2, 'husband': 2, 'child': 2,
+    'children': 2, 'kids': 2, 'family': 3, 'parents': 3,
+    'colleague': 2, 'co-worker': 2, 'cousin': 2,
+    'mom': 2, 'dad': 2, 'mother': 2, 'father': 2,
+}.items())
+
+_DATE_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})',
+    r'(\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4})',
+    r'(\d{1,2}\s+(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{4})',
+))
+_TIME_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'(\d{1,2}:\d{2}\s*(?:AM|PM|am|pm)?)',
+    r'(\d{1,2}\s*(?:AM|PM|am|pm))',
+    r'\b(\d{1,2})\s*(?:o\'clock|oclock|clock)\b',
+))
+
+
+def _has_digit(text: str) -> bool:
+    """Cheap literal screen used to skip number/date/time regexes entirely."""
+    return not _DIGITS.isdisjoint(text)
+
 
 class DataExtractor:
     """Extracts reservation data from user messages with smart detection."""
@@ -35,22 +112,11 @@ class DataExtractor:
     
     def _extract_service_type(self, message_lower: str, extracted_data: Dict[str, Any]):
         """Extract service type from message."""
-        service_patterns = {
-            'haircut|hair cut': 'Haircut',
-            'beard|trim|shape': 'Beard Trim & Shape',
-            'shave': 'Traditional Shave',
-            'color|coloring': 'Hair Coloring',
-            'treatment|keratin': 'Keratin Treatment',
-            'classic': 'Classic Haircut',
-            'massage': 'Massage',
-            'dinner|dining': 'Dinner Reservation',
-            'brunch': 'Weekend Brunch',
-            'private|room': 'Private Dining Room',
-            'appointment|booking|reservation': 'General Service'
-        }
+        if not _ANY_SERVICE_RE.search(message_lower):
+            return
         
-        for keyword, service in service_patterns.items():
-            if re.search(keyword, message_lower):
+        for pattern, service in _SERVICE_PATTERNS:
+            if pattern.search(message_lower):
                 extracted_data['service_type'] = service
                 logger.info(f"Extracted service: {service}")
                 break
@@ -60,78 +126,39 @@ class DataExtractor:
         party_size = None
         
         # ====== STRICT SOLO INDICATORS (definitely 1) ======
-        strict_solo_patterns = [
-            r'\balone\b',
-            r'\bsolo\b',
-            r'\bjust me\b',
-            r'\bonly me\b',
-            r'\bmyself\b',
-            r'\bfor me\b(?!\s+and)',
-            r'\bjust for me\b',
-            r'\bsingle\b',
-            r'\bone person\b',
-            r'\bone\b(?!\s+more|\s+other|\s+extra)',
-            r'\bby myself\b',
-            r'\bon my own\b',
-        ]
-        
-        for pattern in strict_solo_patterns:
-            if re.search(pattern, message_lower):
-                party_size = 1
-                logger.info(f"Strict solo pattern detected -> party size = 1")
-                break
+        if _STRICT_SOLO_RE.search(message_lower):
+            party_size = 1
+            logger.info(f"Strict solo pattern detected -> party size = 1")
         
         # ====== EXPLICIT NUMBERS ======
-        if party_size is None:
-            all_numbers = re.findall(r'\b(\d+)\b', original_message)
-            party_context_words = ['people', 'persons', 'guests', 'person', 'adults', 'kids', 
-                                 'children', 'group', 'party', 'size', 'for', 'of', 'with']
-            
-            for num_str in all_numbers:
-                num = int(num_str)
-                pattern = rf'\b{num}\b\s+(?:{"|".join(party_context_words)})'
-                pattern_rev = rf'(?:{"|".join(party_context_words)})\s+\b{num}\b'
+        if party_size is None and _has_digit(original_message):
+            # One pass over the numbers, checking only the text around each match
+            for match in _NUMBER_RE.finditer(message_lower):
+                num = int(match.group())
+                if not 1 <= num <= self.max_party_size:
+                    continue
                 
-                if re.search(pattern, message_lower, re.IGNORECASE) or re.search(pattern_rev, message_lower, re.IGNORECASE):
-                    if 1 <= num <= self.max_party_size:
-                        party_size = num
-                        logger.info(f"Found party size from explicit number: {party_size}")
-                        break
+                start, end = match.span()
+                if (_PARTY_CONTEXT_AFTER_RE.match(message_lower, end) or
+                        _PARTY_CONTEXT_BEFORE_RE.search(message_lower, max(0, start - _PARTY_CONTEXT_WINDOW), start)):
+                    party_size = num
+                    logger.info(f"Found party size from explicit number: {party_size}")
+                    break
         
         # ====== RELATIONSHIP INDICATORS ======
         if party_size is None:
-            relationship_indicators = {
-                'brother': 2, 'sister': 2, 'friend': 2, 'friends': 2,
-                'partner': 2, 'wife': 2, 'husband': 2, 'child': 2,
-                'children': 2, 'kids': 2, 'family': 3, 'parents': 3,
-                'colleague': 2, 'co-worker': 2, 'cousin': 2,
-                'mom': 2, 'dad': 2, 'mother': 2, 'father': 2,
-            }
-            
-            for relationship, base_size in relationship_indicators.items():
+            for relationship, base_size, relationship_re in _RELATIONSHIP_INDICATORS:
                 if relationship in message_lower:
-                    count = len(re.findall(rf'\b{relationship}\b', message_lower))
+                    count = len(relationship_re.findall(message_lower))
                     party_size = base_size + (count - 1 if count > 1 else 0)
                     logger.info(f"Relationship '{relationship}' -> party size = {party_size}")
                     break
         
         # ====== GROUP INDICATORS WITHOUT EXPLICIT NUMBERS ======
         if party_size is None:
-            group_indicators = [
-                r'\bboth\b',
-                r'\btogether\b',
-                r'\bwe are\b',
-                r'\bwe\'\sre\b',
-                r'\bus\b',
-                r'\ball of us\b',
-                r'\beveryone\b',
-            ]
-            
-            for indicator in group_indicators:
-                if re.search(indicator, message_lower):
-                    party_size = 2
-                    logger.info(f"Group indicator detected -> party size = 2")
-                    break
+            if _GROUP_INDICATOR_RE.search(message_lower):
+                party_size = 2
+                logger.info(f"Group indicator detected -> party size = 2")
         
         # ====== CONTEXTUAL INFERENCE ======
         if party_size is None:
@@ -154,6 +181,8 @@ class DataExtractor:
     def _extract_date_time(self, message_lower: str, original_message: str, extracted_data: Dict[str, Any]):
         """Extract date and time from message."""
         today = datetime.now()
+        # Every explicit date and time pattern below needs at least one digit
+        has_digit = _has_digit(original_message)
         
         # Contextual date patterns
         if 'tonight' in message_lower or 'this evening' in message_lower:
@@ -177,16 +206,10 @@ class DataExtractor:
             next_saturday = today + timedelta(days=days_ahead)
             extracted_data['date'] = next_saturday.strftime('%Y-%m-%d')
             logger.info(f"Extracted date (weekend): {extracted_data['date']}")
-        else:
+        elif has_digit:
             # Try to find date patterns
-            date_patterns = [
-                r'(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})',
-                r'(\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4})',
-                r'(\d{1,2}\s+(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{4})',
-            ]
-            
-            for pattern in date_patterns:
-                match = re.search(pattern, original_message, re.IGNORECASE)
+            for pattern in _DATE_PATTERNS:
+                match = pattern.search(original_message)
                 if match:
                     try:
                         date_str = match.group(1)
@@ -199,14 +222,11 @@ class DataExtractor:
                         continue
         
         # Time extraction
-        time_patterns = [
-            r'(\d{1,2}:\d{2}\s*(?:AM|PM|am|pm)?)',
-            r'(\d{1,2}\s*(?:AM|PM|am|pm))',
-            r'\b(\d{1,2})\s*(?:o\'clock|oclock|clock)\b',
-        ]
+        if not has_digit:
+            return
         
-        for pattern in time_patterns:
-            match = re.search(pattern, original_message, re.IGNORECASE)
+        for pattern in _TIME_PATTERNS:
+            match = pattern.search(original_message)
             if match:
                 time_str = match.group(1).lower()
                 
@@ -1,19 +1,139 @@
 import re
-import pytz
+import time
 import logging
-from datetime import datetime, timedelta, time as dt_time
+from functools import lru_cache
+from datetime import datetime, timedelta, timezone, time as dt_time
 from dateutil.parser import parse
 from typing import Dict, Any, List, Tuple, Optional
-from django.conf import settings
+from .utils import get_setting
 
 logger = logging.getLogger(__name__)
 
+_UTC = timezone.utc
+_MAX_ALTERNATIVE_SLOTS = 4
+_WEEKDAY_NAMES = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+
+# Shapes emitted by the data extractor, tried before falling back to dateutil
+_DATETIME_FORMATS = (
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%d %I:%M %p",
+    "%m/%d/%Y %H:%M",
+    "%m/%d/%Y %I:%M %p",
+    "%Y-%m-%d %H:%M:%S",
+)
+_TIME_FORMATS = ("%I:%M %p", "%I %p", "%H:%M")
+
+
+def _fast_parse(value: str, formats: Tuple[str, ...] = _DATETIME_FORMATS) -> datetime:
+    """Parse with datetime.strptime for known formats, using dateutil only as a fallback."""
+    for fmt in formats:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return parse(value)
+
+
+@lru_cache(maxsize=512)
+def _parse_time_string(time_str: str) -> Optional[dt_time]:
+    """Parse time string like '9:00 AM' to datetime.time."""
+    try:
+        dt = _fast_parse(time_str.strip(), _TIME_FORMATS)
+        return dt.time()
+    except Exception:
+        try:
+            # Try manual parsing
+            time_str = time_str.strip().upper()
+            
+            # AM/PM markers always trail the time
+            if time_str.endswith('AM'):
+                time_str = time_str[:-2].rstrip()
+                is_pm = False
+            elif time_str.endswith('PM'):
+                time_str = time_str[:-2].rstrip()
+                is_pm = True
+            else:
+                is_pm = False
+            
+            hour_str, _, minute_str = time_str.partition(':')
+            hour = int(hour_str)
+            minute = int(minute_str) if minute_str else 0
+            
+            if is_pm and hour != 12:
+                hour += 12
+            elif not is_pm and hour == 12:
+                hour = 0
+                
+            return dt_time(hour, minute)
+        except Exception:
+            return None
+
+
+@lru_cache(maxsize=256)
+def _parse_hours_range(hours_str: str) -> Optional[Tuple[dt_time, dt_time]]:
+    """Parse hours string like '9:00 AM - 7:00 PM' to (open_time, close_time)."""
+    open_close = hours_str.split('-')
+    if len(open_close) != 2:
+        return None
+    
+    open_time = _parse_time_string(open_close[0].strip())
+    close_time = _parse_time_string(open_close[1].strip())
+    if not open_time or not close_time:
+        return None
+    return open_time, close_time
+
+
+@lru_cache(maxsize=128)
+def _compile_shop_hours(hours_items: Tuple[Tuple[str, str], ...]) -> Tuple[Optional[Tuple[str, Optional[Tuple[dt_time, dt_time]]]], ...]:
+    """Build a weekday-indexed table of (hours_str, parsed range) entries, None when closed."""
+    shop_hours = dict(hours_items)
+    table = []
+    for day_name in _WEEKDAY_NAMES:
+        hours_str = shop_hours.get(day_name)
+        if not hours_str or hours_str.lower() == 'closed':
+            table.append(None)
+        else:
+            table.append((hours_str, _parse_hours_range(hours_str)))
+    return tuple(table)
+
+
+def _shop_hours_table(shop_hours: Dict[str, str]) -> Tuple[Optional[Tuple[str, Optional[Tuple[dt_time, dt_time]]]], ...]:
+    """Return the compiled weekday table for a shop_hours dict."""
+    hours_items = tuple(shop_hours.items())
+    try:
+        return _compile_shop_hours(hours_items)
+    except TypeError:
+        # Unhashable values cannot be cached; build the table directly
+        return _compile_shop_hours.__wrapped__(hours_items)
+
+
+@lru_cache(maxsize=32)
+def _min_hours_msg(min_hours: int) -> str:
+    return f"Booking must be at least {min_hours} hour(s) in advance"
+
+
+@lru_cache(maxsize=32)
+def _max_days_msg(max_days: int) -> str:
+    return f"Cannot book more than {max_days} days in advance"
+
+
+def _future_slot_hours(day_start_ts: float, open_hour: int, close_hour: int,
+                       now_ts: float, limit: int) -> List[int]:
+    """Return up to `limit` opening hours whose hourly slot starts after now_ts."""
+    hours = []
+    for hour in range(open_hour, close_hour):
+        if day_start_ts + hour * 3600 > now_ts:
+            hours.append(hour)
+            if len(hours) == limit:
+                break
+    return hours
+
 
 class DateTimeHandler:
     """Handles date/time validation and alternative slot generation."""
     
     def __init__(self):
-        self.timezone = pytz.timezone('UTC')
+        self.timezone = _UTC
     
     def validate_date_time(self, date_str: str, time_str: str, 
                          min_hours_from_now: Optional[int] = None, 
@@ -23,45 +143,47 @@ class DateTimeHandler:
         try:
             # Use settings if not provided
             if min_hours_from_now is None:
-                min_hours_from_now = settings.MIN_BOOKING_HOURS_ADVANCE
+                min_hours_from_now = get_setting('MIN_BOOKING_HOURS_ADVANCE')
             if max_days_in_future is None:
-                max_days_in_future = settings.MAX_ADVANCE_BOOKING_DAYS
-            
-            datetime_str = f"{date_str} {time_str}"
+                max_days_in_future = get_setting('MAX_ADVANCE_BOOKING_DAYS')
             
+            # Normalized extractor output ("YYYY-MM-DD" + "HH:MM") goes through the C parser
             try:
-                requested_dt = parse(datetime_str)
-            except Exception:
-                return False, "Invalid date or time format", None
+                requested_dt = datetime.fromisoformat(f"{date_str}T{time_str}")
+            except ValueError:
+                requested_dt = None
+            
+            if requested_dt is None:
+                try:
+                    requested_dt = _fast_parse(f"{date_str} {time_str}")
+                except Exception:
+                    return False, "Invalid date or time format", None
             
             if not requested_dt.tzinfo:
                 requested_dt = requested_dt.replace(tzinfo=self.timezone)
             
-            current_dt = datetime.now(self.timezone)
+            # Compare POSIX timestamps rather than building timedeltas
+            requested_ts = requested_dt.timestamp()
+            current_ts = time.time()
             
-            if requested_dt < current_dt:
+            if requested_ts < current_ts:
                 return False, "Cannot book in the past", None
             
-            min_time = current_dt + timedelta(hours=min_hours_from_now)
-            if requested_dt < min_time:
-                return False, f"Booking must be at least {min_hours_from_now} hour(s) in advance", None
+            if requested_ts < current_ts + min_hours_from_now * 3600:
+                return False, _min_hours_msg(min_hours_from_now), None
             
-            max_time = current_dt + timedelta(days=max_days_in_future)
-            if requested_dt > max_time:
-                return False, f"Cannot book more than {max_days_in_future} days in advance", None
+            if requested_ts > current_ts + max_days_in_future * 86400:
+                return False, _max_days_msg(max_days_in_future), None
             
             # Check shop operating hours
             if shop_hours:
-                day_of_week = requested_dt.strftime('%A').lower()
+                weekday = requested_dt.weekday()
+                day_hours = _shop_hours_table(shop_hours)[weekday]
                 
-                if day_of_week not in shop_hours:
-                    return False, f"We're closed on {day_of_week.capitalize()}", None
+                if day_hours is None:
+                    return False, f"We're closed on {_WEEKDAY_NAMES[weekday].capitalize()}", None
                 
-                hours_str = shop_hours[day_of_week]
-                if not hours_str or hours_str.lower() == 'closed':
-                    return False, f"We're closed on {day_of_week.capitalize()}", None
-                
-                is_valid, message = self._check_within_shop_hours(requested_dt, hours_str)
+                is_valid, message = self._check_within_shop_hours(requested_dt, day_hours[0])
                 if not is_valid:
                     return False, message, None
             
@@ -75,19 +197,11 @@ class DateTimeHandler:
         """Check if requested time is within shop operating hours."""
         try:
             # Parse hours string like "9:00 AM - 7:00 PM"
-            open_close = hours_str.split('-')
-            if len(open_close) != 2:
+            hours_range = _parse_hours_range(hours_str)
+            if not hours_range:
                 return True, ""  # If can't parse, don't block
             
-            open_time_str = open_close[0].strip()
-            close_time_str = open_close[1].strip()
-            
-            # Convert to 24-hour time
-            open_time = self._parse_time_string(open_time_str)
-            close_time = self._parse_time_string(close_time_str)
-            
-            if not open_time or not close_time:
-                return True, ""  # If can't parse, don't block
+            open_time, close_time = hours_range
             
             # Check if requested time is within hours
             requested_time = requested_dt.time()
@@ -97,99 +211,63 @@ class DateTimeHandler:
                 # Shop closes after midnight
                 if requested_time >= open_time or requested_time <= close_time:
                     return True, ""
-                else:
-                    return False, f"Time must be between {open_time_str} and {close_time_str}"
             else:
                 # Normal hours
                 if open_time <= requested_time <= close_time:
                     return True, ""
-                else:
-                    return False, f"Time must be between {open_time_str} and {close_time_str}"
+            
+            open_time_str, close_time_str = (part.strip() for part in hours_str.split('-'))
+            return False, f"Time must be between {open_time_str} and {close_time_str}"
                     
         except Exception as e:
             logger.error(f"Error checking shop hours: {e}")
             return True, ""  # Don't block if error
     
-    def _parse_time_string(self, time_str: str) -> Optional[dt_time]:
-        """Parse time string like '9:00 AM' to datetime.time."""
-        try:
-            from dateutil import parser
-            dt = parser.parse(time_str)
-            return dt.time()
-        except Exception:
-            try:
-                # Try manual parsing
-                time_str = time_str.strip().upper()
-                original_str = time_str
-                
-                if 'AM' in time_str:
-                    time_str = time_str.replace('AM', '').strip()
-                    is_pm = False
-                elif 'PM' in time_str:
-                    time_str = time_str.replace('PM', '').strip()
-                    is_pm = True
-                else:
-                    is_pm = False
-                
-                parts = time_str.split(':')
-                hour = int(parts[0])
-                minute = int(parts[1]) if len(parts) > 1 else 0
-                
-                if is_pm and hour != 12:
-                    hour += 12
-                elif not is_pm and hour == 12:
-                    hour = 0
-                    
-                return dt_time(hour, minute)
-            except Exception:
-                return None
-    
     def generate_alternative_slots(self, base_datetime: datetime, 
                                  shop_hours: Optional[Dict[str, str]] = None,
                                  available_slots: Optional[List[datetime]] = None) -> List[datetime]:
         """Generate alternative time slots within shop hours."""
         try:
             alternatives = []
-            current_dt = datetime.now(self.timezone)
+            seen = set()  # slot timestamps already in alternatives
+            current_ts = time.time()
+            
+            hours_table = _shop_hours_table(shop_hours) if shop_hours else None
             
             # Try same day, different times
-            if shop_hours:
-                day_of_week = base_datetime.strftime('%A').lower()
-                if day_of_week in shop_hours:
-                    hours_str = shop_hours[day_of_week]
-                    if hours_str and hours_str.lower() != 'closed':
-                        open_time = self._parse_time_string(hours_str.split('-')[0].strip())
-                        close_time = self._parse_time_string(hours_str.split('-')[1].strip())
-                        
-                        if open_time and close_time:
-                            # Generate slots every hour
-                            hour = open_time.hour
-                            while hour < close_time.hour:
-                                slot = base_datetime.replace(hour=hour, minute=0)
-                                if slot > current_dt and slot not in alternatives:
-                                    alternatives.append(slot)
-                                hour += 1
+            if hours_table:
+                day_hours = hours_table[base_datetime.weekday()]
+                if day_hours is not None and day_hours[1]:
+                    open_time, close_time = day_hours[1]
+                    
+                    # Generate slots every hour using epoch arithmetic; only
+                    # the earliest few can survive the final cut, so only
+                    # those are turned into datetimes.
+                    day_start_ts = base_datetime.replace(hour=0, minute=0).timestamp()
+                    for hour in _future_slot_hours(day_start_ts, open_time.hour, close_time.hour,
+                                                   current_ts, _MAX_ALTERNATIVE_SLOTS):
+                        seen.add(day_start_ts + hour * 3600)
+                        alternatives.append(base_datetime.replace(hour=hour, minute=0))
             
             # If no shop hours or not enough slots, use default logic
             if len(alternatives) < 3:
                 # Try next few days at reasonable times
                 for days_ahead in [1, 2, 3, 7]:
-                    if len(alternatives) >= 4:
+                    if len(alternatives) >= _MAX_ALTERNATIVE_SLOTS:
                         break
                     
                     new_date = base_datetime + timedelta(days=days_ahead)
-                    new_day = new_date.strftime('%A').lower()
                     
-                    if shop_hours and new_day in shop_hours:
-                        hours_str = shop_hours[new_day]
-                        if hours_str and hours_str.lower() != 'closed':
-                            slot = new_date.replace(hour=14, minute=0)  # 2 PM
-                            if slot > current_dt and slot not in alternatives:
-                                alternatives.append(slot)
+                    if hours_table and hours_table[new_date.weekday()] is not None:
+                        slot = new_date.replace(hour=14, minute=0)  # 2 PM
+                        slot_ts = slot.timestamp()
+                        if slot_ts > current_ts and slot_ts not in seen:
+                            seen.add(slot_ts)
+                            alternatives.append(slot)
             
             # Sort and return
             alternatives.sort()
-            return alternatives[:4]
+            return alternatives[:_MAX_ALTERNATIVE_SLOTS]
             
         except Exception as e:
             logger.error(f"Alternative slots generation error: {e}")
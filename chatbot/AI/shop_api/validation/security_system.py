@@ -1,5 +1,6 @@
 import logging
-from typing import Dict, Any, List, Tuple
+from functools import partial
+from typing import Callable, Dict, Any, List, Tuple
 from .data_extractor import DataExtractor
 from .validator import DataValidator
 from .date_time_handler import DateTimeHandler
@@ -8,133 +9,184 @@ from datetime import datetime, timedelta, time
 logger = logging.getLogger(__name__)
 
 
-class SecurityValidationSystem:
-    """Main security validation system coordinating all components."""
+class ValidationResult:
+    """Accumulates the outcome of a comprehensive reservation validation.
     
-    def __init__(self):
-        self.extractor = DataExtractor()
-        self.validator = DataValidator()
-        self.date_time_handler = DateTimeHandler()
+    Supports dict-style access (result['errors'], result.get(...)) so callers
+    can keep treating it like the dict this method used to return.
+    """
     
-    def extract_reservation_data(self, message: str) -> Dict[str, Any]:
-        """Extract reservation data from user message."""
-        return self.extractor.extract_reservation_data(message)
+    __slots__ = ('is_valid', 'errors', 'warnings', 'corrected_data',
+                 '_alternative_slots', '_alternatives_factory')
+    _KEYS = ('is_valid', 'errors', 'warnings', 'corrected_data', 'alternative_slots')
     
-    def validate_phone_number(self, phone_number: str, country_code: str = "US") -> Tuple[bool, str]:
-        """Validate phone number."""
-        return self.validator.validate_phone_number(phone_number, country_code)
+    def __init__(self):
+        self.is_valid = True
+        self.errors = []
+        self.warnings = []
+        self.corrected_data = {}
+        self._alternative_slots = []
+        self._alternatives_factory = None
+    
+    @property
+    def alternative_slots(self) -> List[datetime]:
+        # Deferred alternatives are only generated the first time they are read
+        if self._alternatives_factory is not None:
+            self._alternative_slots = self._alternatives_factory()
+            self._alternatives_factory = None
+        return self._alternative_slots
     
-    def validate_name(self, name: str) -> Tuple[bool, str]:
-        """Validate customer name."""
-        return self.validator.validate_name(name)
+    @alternative_slots.setter
+    def alternative_slots(self, slots: List[datetime]):
+        self._alternative_slots = slots
+        self._alternatives_factory = None
     
-    def validate_email(self, email: str) -> Tuple[bool, str]:
-        """Validate email."""
-        return self.validator.validate_email(email)
+    def defer_alternative_slots(self, factory: Callable[[], List[datetime]]):
+        """Register a callable that produces the alternative slots on first access."""
+        self._alternatives_factory = factory
     
-    def validate_date_time(self, date_str: str, time_str: str, 
-                         min_hours_from_now: int = None, 
-                         max_days_in_future: int = None,
-                         shop_hours: Dict = None) -> Tuple[bool, str, datetime]:
-        """Validate date and time."""
-        return self.date_time_handler.validate_date_time(
-            date_str, time_str, min_hours_from_now, max_days_in_future, shop_hours
-        )
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
     
-    def validate_party_size(self, party_size: int, max_size: int = None) -> Tuple[bool, str]:
-        """Validate party size."""
-        return self.validator.validate_party_size(party_size, max_size)
+    def __contains__(self, key: str) -> bool:
+        return key in self._KEYS
     
-    def generate_alternative_slots(self, base_datetime: datetime, 
-                                 shop_hours: Dict = None,
-                                 available_slots: List[datetime] = None) -> List[datetime]:
-        """Generate alternative time slots."""
-        return self.date_time_handler.generate_alternative_slots(base_datetime, shop_hours, available_slots)
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in self._KEYS else default
     
-    def format_alternative_slots(self, slots: List[datetime]) -> str:
-        """Format alternative slots for display."""
-        return self.date_time_handler.format_alternative_slots(slots)
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the result as a plain dict, generating deferred alternatives."""
+        return {key: getattr(self, key) for key in self._KEYS}
+
+
+class SecurityValidationSystem:
+    """Main security validation system coordinating all components."""
     
-    def _check_within_shop_hours(self, requested_dt: datetime, hours_str: str) -> Tuple[bool, str]:
-        """Check if requested time is within shop hours."""
-        return self.date_time_handler._check_within_shop_hours(requested_dt, hours_str)
+    def __init__(self):
+        self.extractor = DataExtractor()
+        self.validator = DataValidator()
+        self.date_time_handler = DateTimeHandler()
+        
+        # Expose component methods directly on the instance so each call is a
+        # single attribute lookup instead of going through a wrapper method.
+        self.extract_reservation_data = self.extractor.extract_reservation_data
+        self.validate_phone_number = self.validator.validate_phone_number
+        self.validate_name = self.validator.validate_name
+        self.validate_email = self.validator.validate_email
+        self.validate_party_size = self.validator.validate_party_size
+        self.validate_date_time = self.date_time_handler.validate_date_time
+        self.generate_alternative_slots = self.date_time_handler.generate_alternative_slots
+        self.format_alternative_slots = self.date_time_handler.format_alternative_slots
+        self._check_within_shop_hours = self.date_time_handler._check_within_shop_hours
     
     def comprehensive_reservation_validation(self, reservation_data: Dict[str, Any], 
-                                          shop_hours: Dict = None) -> Dict[str, Any]:
-        """Comprehensive validation of reservation data."""
-        validation_results = {
-            'is_valid': True,
-            'errors': [],
-            'warnings': [],
-            'corrected_data': {},
-            'alternative_slots': []
-        }
+                                          shop_hours: Dict = None) -> ValidationResult:
+        """Comprehensive validation of reservation data.
+        
+        On success the alternative slots are not generated up front; they are
+        produced the first time result['alternative_slots'] is read.
+        """
+        return self._validate_reservation(reservation_data, shop_hours, self.validate_date_time)
+    
+    def comprehensive_reservation_validation_batch(self, records: List[Dict[str, Any]],
+                                                   shop_hours: Dict = None) -> List[ValidationResult]:
+        """Validate many reservations at once (bulk import / admin review).
+        
+        Records in a bulk load tend to share date/time slots, so each distinct
+        (date, time) pair is validated once per batch and reused.
+        """
+        date_time_results = {}
+        validate_date_time = self.validate_date_time
+        
+        def cached_validate_date_time(date_str, time_str, shop_hours=None):
+            key = (date_str, time_str)
+            try:
+                return date_time_results[key]
+            except KeyError:
+                outcome = date_time_results[key] = validate_date_time(date_str, time_str, shop_hours=shop_hours)
+                return outcome
+            except TypeError:
+                return validate_date_time(date_str, time_str, shop_hours=shop_hours)
+        
+        return [
+            self._validate_reservation(record, shop_hours, cached_validate_date_time)
+            for record in records
+        ]
+    
+    def _validate_reservation(self, reservation_data: Dict[str, Any], shop_hours: Dict,
+                              validate_date_time: Callable[..., Tuple[bool, str, datetime]]) -> ValidationResult:
+        result = ValidationResult()
+        errors_append = result.errors.append
+        corrected = result.corrected_data
+        get = reservation_data.get
         
         try:
             if 'customer_name' in reservation_data:
                 name_valid, name_corrected = self.validate_name(reservation_data['customer_name'])
                 if not name_valid:
-                    validation_results['is_valid'] = False
-                    validation_results['errors'].append(f"Name: {name_corrected}")
+                    result.is_valid = False
+                    errors_append(f"Name: {name_corrected}")
                 else:
-                    validation_results['corrected_data']['customer_name'] = name_corrected
+                    corrected['customer_name'] = name_corrected
             
             if 'phone_number' in reservation_data:
                 phone_valid, phone_corrected = self.validate_phone_number(reservation_data['phone_number'])
                 if not phone_valid:
-                    validation_results['is_valid'] = False
-                    validation_results['errors'].append(f"Phone: {phone_corrected}")
+                    result.is_valid = False
+                    errors_append(f"Phone: {phone_corrected}")
                 else:
-                    validation_results['corrected_data']['phone_number'] = phone_corrected
+                    corrected['phone_number'] = phone_corrected
             
-            if 'email' in reservation_data and reservation_data['email']:
-                email_valid, email_corrected = self.validate_email(reservation_data['email'])
+            email = get('email')
+            if email:
+                email_valid, email_corrected = self.validate_email(email)
                 if not email_valid:
-                    validation_results['warnings'].append(f"Email: {email_corrected}")
+                    result.warnings.append(f"Email: {email_corrected}")
                 else:
-                    validation_results['corrected_data']['email'] = email_corrected
+                    corrected['email'] = email_corrected
             
             if 'date' in reservation_data and 'time' in reservation_data:
-                dt_valid, dt_message, validated_dt = self.validate_date_time(
+                dt_valid, dt_message, validated_dt = validate_date_time(
                     reservation_data['date'], 
                     reservation_data['time'],
                     shop_hours=shop_hours
                 )
                 
                 if not dt_valid:
-                    validation_results['is_valid'] = False
-                    validation_results['errors'].append(f"Date/Time: {dt_message}")
+                    result.is_valid = False
+                    errors_append(f"Date/Time: {dt_message}")
                     
                     if validated_dt:
-                        alternatives = self.generate_alternative_slots(validated_dt, shop_hours)
-                        validation_results['alternative_slots'] = alternatives
+                        result.alternative_slots = self.generate_alternative_slots(validated_dt, shop_hours)
                 else:
-                    validation_results['corrected_data']['datetime'] = validated_dt
-                    validation_results['corrected_data']['date'] = validated_dt.strftime("%Y-%m-%d")
-                    validation_results['corrected_data']['time'] = validated_dt.strftime("%H:%M")
+                    corrected['datetime'] = validated_dt
+                    corrected['date'] = validated_dt.strftime("%Y-%m-%d")
+                    corrected['time'] = validated_dt.strftime("%H:%M")
             
             if 'party_size' in reservation_data:
                 try:
                     party_size = int(reservation_data['party_size'])
                     party_valid, party_message = self.validate_party_size(party_size)
                     if not party_valid:
-                        validation_results['is_valid'] = False
-                        validation_results['errors'].append(f"Party Size: {party_message}")
+                        result.is_valid = False
+                        errors_append(f"Party Size: {party_message}")
                     else:
-                        validation_results['corrected_data']['party_size'] = party_size
+                        corrected['party_size'] = party_size
                 except (ValueError, TypeError):
-                    validation_results['is_valid'] = False
-                    validation_results['errors'].append("Party Size: Must be a valid number")
+                    result.is_valid = False
+                    errors_append("Party Size: Must be a valid number")
             
-            if ('datetime' in validation_results['corrected_data'] and 
-                not validation_results['alternative_slots']):
-                base_dt = validation_results['corrected_data']['datetime']
-                validation_results['alternative_slots'] = self.generate_alternative_slots(base_dt, shop_hours)
+            if 'datetime' in corrected and not result.alternative_slots:
+                result.defer_alternative_slots(
+                    partial(self.generate_alternative_slots, corrected['datetime'], shop_hours)
+                )
             
-            return validation_results
+            return result
             
         except Exception as e:
             logger.error(f"Comprehensive validation error: {e}")
-            validation_results['is_valid'] = False
-            validation_results['errors'].append(f"Validation system error: {str(e)}")
-            return validation_results
\ No newline at end of file
+            result.is_valid = False
+            errors_append(f"Validation system error: {str(e)}")
+            return result
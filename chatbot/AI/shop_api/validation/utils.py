@@ -0,0 +1,22 @@
+from typing import Any, Dict
+from django.conf import settings
+from django.core.signals import setting_changed
+
+_SETTINGS_CACHE: Dict[str, Any] = {}
+
+
+def get_setting(name: str) -> Any:
+    """Return a Django setting, caching it to skip LazySettings lookups on hot paths."""
+    try:
+        return _SETTINGS_CACHE[name]
+    except KeyError:
+        value = _SETTINGS_CACHE[name] = getattr(settings, name)
+        return value
+
+
+def _clear_settings_cache(**kwargs):
+    # Keep override_settings() and similar test helpers working
+    _SETTINGS_CACHE.pop(kwargs.get('setting'), None)
+
+
+setting_changed.connect(_clear_settings_cache)
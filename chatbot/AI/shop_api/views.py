@@ -2,9 +2,12 @@
 import os
 import time
 import logging
+import threading
 from datetime import datetime
+from django.core.cache import cache
+from django.db import connection
 from django.shortcuts import render
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.utils.decorators import method_decorator
@@ -18,17 +21,113 @@ from .agent.base_agent import UniversalShopAgent
 from .validation.security_system import SecurityValidationSystem
 from .session_manager import EnhancedSessionManager
 from .database_manager import DatabaseManager
+from .tasks import submit_task, get_task, tasks_supported
+from .renderers import ORJSONRenderer
 
 
 logger = logging.getLogger(__name__)
 
-# Initialize managers
-data_manager = DatabaseManager()
-validation_system = SecurityValidationSystem()
-session_manager = EnhancedSessionManager()
-universal_agent = UniversalShopAgent(data_manager=data_manager, session_manager=session_manager)
+# The shop list rarely changes, so the validated list is briefly cached
+ALL_SHOPS_CACHE_KEY = "all_shops_v1"
+ALL_SHOPS_CACHE_TIMEOUT = 60
+SHOP_EXISTS_CACHE_TIMEOUT = 300
+SHOP_CONTEXT_CACHE_TIMEOUT = 60
+SHOP_COUNT_CACHE_KEY = "shops:count"
+SHOP_COUNT_CACHE_TIMEOUT = 60
+LANDING_SHOPS_CACHE_KEY = "shops:landing"
+LANDING_SHOPS_CACHE_TIMEOUT = 300
 
-class HealthCheckView(APIView):
+# Managers are created lazily on first use, so each worker process builds its
+# own after fork and importing this module stays cheap.
+_managers = {}
+_managers_lock = threading.Lock()
+
+def _get_manager(name, factory):
+    manager = _managers.get(name)
+    if manager is None:
+        with _managers_lock:
+            manager = _managers.get(name)
+            if manager is None:
+                manager = _managers[name] = factory()
+    return manager
+
+def get_data_manager():
+    return _get_manager('data_manager', DatabaseManager)
+
+def get_validation_system():
+    return _get_manager('validation_system', SecurityValidationSystem)
+
+def get_session_manager():
+    return _get_manager('session_manager', EnhancedSessionManager)
+
+def get_universal_agent():
+    # Resolved before _get_manager takes _managers_lock, which is not reentrant
+    data_manager = get_data_manager()
+    session_manager = get_session_manager()
+    return _get_manager('universal_agent', lambda: UniversalShopAgent(
+        data_manager=data_manager, session_manager=session_manager
+    ))
+
+# (epoch second, formatted timestamp); replaced as a whole so readers never
+# see a half-updated pair
+_timestamp_cache = (None, None)
+
+def current_timestamp():
+    """Local time as an ISO string at second resolution, formatted once per second."""
+    global _timestamp_cache
+    now = int(time.time())
+    second, formatted = _timestamp_cache
+    if second != now:
+        formatted = datetime.fromtimestamp(now).isoformat()
+        _timestamp_cache = (now, formatted)
+    return formatted
+
+_json_renderer = ORJSONRenderer()
+
+def json_response(data, status=200):
+    """Plain Django JSON response for lightweight views that skip DRF's dispatch."""
+    return HttpResponse(_json_renderer.render(data), content_type='application/json', status=status)
+
+def get_client_ip(request):
+    """First address in X-Forwarded-For, else REMOTE_ADDR."""
+    meta = request.META
+    x_forwarded_for = meta.get('HTTP_X_FORWARDED_FOR')
+    if x_forwarded_for:
+        return x_forwarded_for.partition(',')[0].strip()
+    return meta.get('REMOTE_ADDR')
+
+def shop_exists(shop_id):
+    """Cached DatabaseManager.shop_exists; shop folders are rarely added or removed."""
+    return cache.get_or_set(
+        f"shop:exists:{shop_id}",
+        lambda: get_data_manager().shop_exists(shop_id),
+        SHOP_EXISTS_CACHE_TIMEOUT
+    )
+
+def load_shop_context(shop_id):
+    """Cached DatabaseManager.load_shop_context; missing shops raise and are not cached."""
+    return cache.get_or_set(
+        f"shop:ctx:{shop_id}",
+        lambda: get_data_manager().load_shop_context(shop_id),
+        SHOP_CONTEXT_CACHE_TIMEOUT
+    )
+
+def load_shop_details(shop_id):
+    """Shop details validated by ShopDetailsSerializer (raw details if invalid), cached per shop."""
+    def build():
+        shop_details = load_shop_context(shop_id)['shop_details']
+        serializer = ShopDetailsSerializer(data=shop_details)
+        return serializer.data if serializer.is_valid() else shop_details
+    
+    return cache.get_or_set(f"shop:details:{shop_id}", build, SHOP_CONTEXT_CACHE_TIMEOUT)
+
+def warm_managers():
+    """Build every manager up front, e.g. from a server's post-fork hook."""
+    get_data_manager()
+    get_validation_system()
+    get_universal_agent()
+
+class HealthCheckView(View):
     def get(self, request):
         current_time = time.time()
         start_time = getattr(HealthCheckView, '_start_time', current_time)
@@ -36,18 +135,23 @@ class HealthCheckView(APIView):
         
         health_status = {
             "status": "healthy",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": current_timestamp(),
             "uptime_seconds": uptime_seconds,
             "version": "2.0.0",
             "environment": "development" if os.getenv("DEBUG") == "true" else "production",
         }
         
-        # Check shops database connectivity
+        # Check shops database connectivity; the count is cached so frequent
+        # probes do not re-read every shop's details file
         try:
-            shops = data_manager.list_all_shops()
+            total_shops = cache.get_or_set(
+                SHOP_COUNT_CACHE_KEY,
+                lambda: len(get_data_manager().list_all_shops()),
+                SHOP_COUNT_CACHE_TIMEOUT
+            )
             health_status["shops_database"] = {
                 "status": "healthy",
-                "total_shops": len(shops)
+                "total_shops": total_shops
             }
         except Exception as e:
             health_status["shops_database"] = {
@@ -55,17 +159,30 @@ class HealthCheckView(APIView):
                 "error": str(e)
             }
         
-        return Response(health_status)
+        # Check the Django database with a trivial round trip
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            health_status["database"] = {"status": "healthy"}
+        except Exception as e:
+            health_status["database"] = {
+                "status": "unhealthy",
+                "error": str(e)
+            }
+        
+        return json_response(health_status)
 
 class ShopMessageView(APIView):
+    renderer_classes = [ORJSONRenderer]
+    
     def post(self, request, shop_id):
         try:
-            print(f"DEBUG: Request data received: {request.data}")
-            print(f"DEBUG: Request content type: {request.content_type}")
-            print(f"DEBUG: Headers: {dict(request.headers)}")
+            logger.debug("Request data received: %s", request.data)
+            logger.debug("Request content type: %s", request.content_type)
+            logger.debug("Headers: %s", request.headers)
             
             # Validate shop exists
-            if not data_manager.shop_exists(shop_id):
+            if not shop_exists(shop_id):
                 return Response(
                     {"success": False, "error": f"Shop {shop_id} not found."},
                     status=status.HTTP_404_NOT_FOUND
@@ -73,19 +190,9 @@ class ShopMessageView(APIView):
             
             # Validate request data
             serializer = ChatRequestSerializer(data=request.data)
-            print(f"DEBUG: Serializer initial data: {request.data}")
-            
-            if not serializer.is_valid():
-                print(f"DEBUG: Serializer errors: {serializer.errors}")
-                print(f"DEBUG: Raw request body: {request.body}")
-                return Response(
-                    {"success": False, "error": serializer.errors},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            
-            # Validate request data
-            serializer = ChatRequestSerializer(data=request.data)   
             if not serializer.is_valid():
+                logger.debug("Serializer errors: %s", serializer.errors)
+                logger.debug("Raw request body: %s", request.body)
                 return Response(
                     {"success": False, "error": serializer.errors},
                     status=status.HTTP_400_BAD_REQUEST
@@ -99,45 +206,27 @@ class ShopMessageView(APIView):
             user_phone = data.get('user_phone', '')
             
             # Get client IP
-            client_ip = self.get_client_ip(request)
+            client_ip = get_client_ip(request)
             user_agent = request.META.get('HTTP_USER_AGENT', '')
             
-            # Print user information to console
             if user_name and user_email:
-                print("=" * 50)
-                print("USER INFORMATION DETECTED!")
-                print(f"User Email: {user_email}")
-                print(f"User Name: {user_name}")
-                print(f"User Phone: {user_phone}")
-                print(f"Session ID: {session_id}")
-                print(f"Shop ID: {shop_id}")
-                print(f"Message: {user_message}")
-                print("=" * 50)
+                logger.debug(
+                    "User information detected: email=%s name=%s phone=%s session=%s shop=%s message=%s",
+                    user_email, user_name, user_phone, session_id, shop_id, user_message
+                )
             
             # Process message through agent
-            response = universal_agent.handle_shop_request(
-                user_message=user_message,
-                shop_id=shop_id,
-                session_id=session_id,
-                user_agent=user_agent,
-                ip_address=client_ip,
-                user_email=user_email,
-                user_name=user_name,
-                user_phone=user_phone
-            )
-            
-            return Response({
-                "response": response["response"],
-                "shop_id": shop_id,
-                "shop_name": response.get("shop_name", "Unknown Shop"),
-                "success": True,
-                "session_id": session_id,
-                "agents_used": response.get("agents_used", []),
-                "model": response.get("model", "unknown"),
-                "timestamp": datetime.now().isoformat(),
-                "user_authenticated": bool(user_email and user_name),
-                "user_name": user_name if user_name else None
-            })
+            agent_request = {
+                'user_message': user_message,
+                'shop_id': shop_id,
+                'session_id': session_id,
+                'user_agent': user_agent,
+                'ip_address': client_ip,
+                'user_email': user_email,
+                'user_name': user_name,
+                'user_phone': user_phone
+            }
+            return self.handle_agent_request(shop_id, agent_request)
             
         except Exception as e:
             logger.error(f"Error handling shop message: {e}")
@@ -146,86 +235,140 @@ class ShopMessageView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
     
-    def get_client_ip(self, request):
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0]
-        else:
-            ip = request.META.get('REMOTE_ADDR')
-        return ip
+    def handle_agent_request(self, shop_id, agent_request):
+        return Response(self.run_agent_request(agent_request))
+    
+    @staticmethod
+    def run_agent_request(agent_request):
+        """Process a message through the agent and build the response payload."""
+        response = get_universal_agent().handle_shop_request(**agent_request)
+        user_email = agent_request['user_email']
+        user_name = agent_request['user_name']
+        
+        return {
+            "response": response["response"],
+            "shop_id": agent_request['shop_id'],
+            "shop_name": response.get("shop_name", "Unknown Shop"),
+            "success": True,
+            "session_id": agent_request['session_id'],
+            "agents_used": response.get("agents_used", []),
+            "model": response.get("model", "unknown"),
+            "timestamp": current_timestamp(),
+            "user_authenticated": bool(user_email and user_name),
+            "user_name": user_name if user_name else None
+        }
 
-class ShopServicesView(APIView):
+class ShopMessageTaskView(ShopMessageView):
+    """Queue a message for the agent and return immediately with a task id.
+    
+    The reply is fetched from ShopMessageTaskStatusView, so a slow LLM call
+    does not hold the request open. Task state lives in the Django cache, so
+    the endpoint answers 503 unless CACHES points at a backend shared by all
+    workers, and also once the local task queue is full.
+    """
+    def handle_agent_request(self, shop_id, agent_request):
+        if not tasks_supported():
+            return Response(
+                {"success": False, "error": "Background messages are not available on this server"},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+        
+        task_id = submit_task(shop_id, self.run_agent_request, agent_request)
+        if task_id is None:
+            return Response(
+                {"success": False, "error": "Server is busy, please retry shortly"},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+        return Response({
+            "task_id": task_id,
+            "status": "pending",
+            "shop_id": shop_id,
+            "session_id": agent_request['session_id'],
+            "success": True
+        }, status=status.HTTP_202_ACCEPTED)
+
+class ShopMessageTaskStatusView(APIView):
+    renderer_classes = [ORJSONRenderer]
+    
+    def get(self, request, shop_id, task_id):
+        task = get_task(shop_id, task_id)
+        if task is None:
+            return Response(
+                {"success": False, "error": f"Task {task_id} not found"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        if task['status'] == 'completed':
+            return Response({"task_id": task_id, "status": "completed", **task['result']})
+        
+        if task['status'] == 'failed':
+            return Response(
+                {"task_id": task_id, "status": "failed", "success": False, "error": "Internal server error"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+        
+        return Response({"task_id": task_id, "status": task['status'], "success": True})
+
+class ShopServicesView(View):
     def get(self, request, shop_id):
         try:
-            if not data_manager.shop_exists(shop_id):
-                return Response(
+            if not shop_exists(shop_id):
+                return json_response(
                     {"success": False, "error": f"Shop {shop_id} not found"},
                     status=status.HTTP_404_NOT_FOUND
                 )
             
-            shop_context = data_manager.load_shop_context(shop_id)
+            shop_context = load_shop_context(shop_id)
             shop_details = shop_context['shop_details']
             services_data = shop_context['services']
             
-            return Response({
+            return json_response({
                 "shop_name": shop_details.get('shop_name', 'Unknown Shop'),
                 "services": services_data.get('services', []),
                 "success": True,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": current_timestamp()
             })
         except Exception as e:
             logger.error(f"Error getting shop services: {e}")
-            return Response(
+            return json_response(
                 {"success": False, "error": str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
-class ShopInfoView(APIView):
+class ShopInfoView(View):
     def get(self, request, shop_id):
         try:
-            if not data_manager.shop_exists(shop_id):
-                return Response(
+            if not shop_exists(shop_id):
+                return json_response(
                     {"success": False, "error": f"Shop {shop_id} not found"},
                     status=status.HTTP_404_NOT_FOUND
                 )
             
-            shop_context = data_manager.load_shop_context(shop_id)
-            shop_details = shop_context['shop_details']
-            
-            # Validate with serializer
-            serializer = ShopDetailsSerializer(data=shop_details)
-            if serializer.is_valid():
-                return Response({
-                    "shop_details": serializer.data,
-                    "success": True,
-                    "timestamp": datetime.now().isoformat()
-                })
-            else:
-                return Response({
-                    "shop_details": shop_details,
-                    "success": True,
-                    "timestamp": datetime.now().isoformat()
-                })
+            return json_response({
+                "shop_details": load_shop_details(shop_id),
+                "success": True,
+                "timestamp": current_timestamp()
+            })
         except Exception as e:
             logger.error(f"Error getting shop info: {e}")
-            return Response(
+            return json_response(
                 {"success": False, "error": str(e)},
                 status=status.HTTP_404_NOT_FOUND
             )
 
 class AllShopsView(APIView):
+    renderer_classes = [ORJSONRenderer]
+    
     def get(self, request):
         try:
-            shops = data_manager.list_all_shops()
-            
-            # Validate each shop with serializer
-            valid_shops = []
-            for shop in shops:
-                serializer = ShopDetailsSerializer(data=shop)
-                if serializer.is_valid():
-                    valid_shops.append(serializer.data)
-                else:
-                    valid_shops.append(shop)
+            valid_shops = cache.get(ALL_SHOPS_CACHE_KEY)
+            if valid_shops is None:
+                shops = get_data_manager().list_all_shops()
+                
+                # Validate the whole list in one serializer pass
+                serializer = ShopDetailsSerializer(data=shops, many=True)
+                valid_shops = serializer.data if serializer.is_valid() else shops
+                cache.set(ALL_SHOPS_CACHE_KEY, valid_shops, ALL_SHOPS_CACHE_TIMEOUT)
             
             return Response({
                 "shops": valid_shops,
@@ -240,22 +383,40 @@ class AllShopsView(APIView):
             )
 
 class ConversationHistoryView(APIView):
+    renderer_classes = [ORJSONRenderer]
+    
     def get(self, request, shop_id, session_id):
         try:
+            # Only the rendered columns, as plain dicts streamed straight from
+            # the cursor; no FK fields are read, so no join is needed
             history = ConversationHistory.objects.filter(
                 session_id=session_id, 
                 shop_id=shop_id
-            ).order_by('timestamp')[:20]
+            ).order_by('timestamp').values(
+                'user_message', 'assistant_response', 'timestamp', 'message_type', 'metadata'
+            )[:20]
+            
+            history_data = [
+                {
+                    'user': entry['user_message'],
+                    'assistant': entry['assistant_response'],
+                    'timestamp': entry['timestamp'].isoformat(),
+                    'type': entry['message_type'],
+                    'metadata': entry['metadata']
+                }
+                for entry in history.iterator(chunk_size=20)
+            ]
             
-            history_data = []
-            for entry in history:
-                history_data.append({
-                    'user': entry.user_message,
-                    'assistant': entry.assistant_response,
-                    'timestamp': entry.timestamp.isoformat(),
-                    'type': entry.message_type,
-                    'metadata': entry.metadata
-                })
+            # Include the newest turns still waiting in the write buffer
+            if len(history_data) < 20:
+                for entry in get_session_manager().get_buffered_history(session_id, shop_id)[:20 - len(history_data)]:
+                    history_data.append({
+                        'user': entry.user_message,
+                        'assistant': entry.assistant_response,
+                        'timestamp': entry.timestamp.isoformat(),
+                        'type': entry.message_type,
+                        'metadata': entry.metadata
+                    })
             
             return Response({
                 "session_id": session_id,
@@ -278,7 +439,7 @@ class DebugExtractionView(View):
             data = json.loads(request.body)
             message = data.get("message", "")
             
-            extracted_data = validation_system.extract_reservation_data(message)
+            extracted_data = get_validation_system().extract_reservation_data(message)
             
             return JsonResponse({
                 "message": message,
@@ -289,26 +450,35 @@ class DebugExtractionView(View):
             logger.error(f"Debug extraction error: {e}")
             return JsonResponse({"success": False, "error": str(e)})
 
-def frontend_view(request):
-    """Enhanced frontend view with shop data"""
-    try:
-        # Get shops for the template
-        shops = data_manager.list_all_shops()
-        
-        # Prepare shop data for template
-        shop_data = []
-        for shop in shops:
-            shop_data.append({
+def get_landing_shops():
+    """Template-ready shop list for the landing page, rebuilt at most every few minutes."""
+    shop_data = cache.get(LANDING_SHOPS_CACHE_KEY)
+    if shop_data is None:
+        shop_data = [
+            {
                 'id': shop.get('shop_id'),
                 'name': shop.get('shop_name', 'Unknown Shop'),
                 'address': shop.get('address', ''),
                 'phone': shop.get('phone', ''),
                 'category': shop.get('category', 'Shop')
-            })
+            }
+            for shop in get_data_manager().list_all_shops()
+        ]
+        cache.set(LANDING_SHOPS_CACHE_KEY, shop_data, LANDING_SHOPS_CACHE_TIMEOUT)
+    return shop_data
+
+# Not wrapped in cache_page: index.html may render the visitor's CSRF token,
+# and cache_page stores the response before CsrfViewMiddleware sets the
+# cookie and adds Vary: Cookie, so one visitor's token would be served to
+# everyone. The expensive part, the shop list, is cached by get_landing_shops.
+def frontend_view(request):
+    """Enhanced frontend view with shop data"""
+    try:
+        shop_data = get_landing_shops()
         
         return render(request, 'index.html', {
             'shops': shop_data,
-            'total_shops': len(shops),
+            'total_shops': len(shop_data),
             'app_name': 'SmartReserver',
             'year': datetime.now().year
         })
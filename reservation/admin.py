@@ -1,17 +1,31 @@
 from django.contrib import admin
+from django.db.models import Prefetch
+from business.models import Services
 from .models import Reservation, ReservationPolicy
 
 
 @admin.register(Reservation)
 class ReservationAdmin(admin.ModelAdmin):
-    list_display = ('id', 'business', 'user', 'services__name', 'reservation_date', 'status')
+    list_display = ('id', 'business', 'user', 'services_names', 'reservation_date', 'status')
+    list_select_related = ('business', 'user')
     search_fields = ('business__name', 'user__username', 'services__name', 'status')
     ordering = ('-reservation_date',)
     list_filter = ('status', 'business__name')
 
+    def get_queryset(self, request):
+        # One extra query for the services of the whole page instead of one per row
+        return super().get_queryset(request).prefetch_related(
+            Prefetch('services', queryset=Services.objects.only('id', 'name'))
+        )
+
+    @admin.display(description='Services')
+    def services_names(self, obj):
+        return ", ".join(service.name for service in obj.services.all())
+
 @admin.register(ReservationPolicy)
 class ReservationPolicyAdmin(admin.ModelAdmin):
     list_display = ('business', 'policy_name', 'max_reservations_per_day', 'cancellation_deadline_hours')
+    list_select_related = ('business',)
     search_fields = ('business__name', 'policy_name')
     ordering = ('business__name',)
     list_filter = ('business__name',)
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.4 on 2026-10-15 23:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('business', '0001_initial'),
+        ('reservation', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='reservationpolicy',
+            options={'ordering': ['policy_name'], 'verbose_name': 'Reservation Policy', 'verbose_name_plural': 'Reservation Policies'},
+        ),
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['reservation_date', 'reservation_time'], name='reservation_reserva_a38a9e_idx'),
+        ),
+    ]
@@ -17,7 +17,9 @@ class ReservationPolicy(models.Model):
     class Meta:
         verbose_name = "Reservation Policy"
         verbose_name_plural = "Reservation Policies"
-        ordering = ['business__name', 'policy_name']
+        # Sorting on business__name joined Business on every query; the admin
+        # still orders by business name explicitly
+        ordering = ['policy_name']
 
 class Reservation(models.Model):
     business = models.ForeignKey('business.Business', on_delete=models.CASCADE)
@@ -42,6 +44,10 @@ class Reservation(models.Model):
         verbose_name = "Reservation"
         verbose_name_plural = "Reservations"
         ordering = ['reservation_date', 'reservation_time']
+        indexes = [
+            # Matches the default ordering; also serves date-only filters and sorts
+            models.Index(fields=['reservation_date', 'reservation_time']),
+        ]
 
 
 